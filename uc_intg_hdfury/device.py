@@ -5,9 +5,9 @@ HDFury Integration for Unfolded Circle Remote Two/3.
 :license: MPL-2.0, see LICENSE for more details.
 """
 import asyncio
+import inspect
 import logging
-from enum import IntEnum
-from pyee.asyncio import AsyncIOEventEmitter
+from typing import Any, Callable
 from uc_intg_hdfury.hdfury_client import HDFuryClient
 from uc_intg_hdfury.media_player import HDFuryMediaPlayer
 from uc_intg_hdfury.remote import HDFuryRemote
@@ -16,15 +16,20 @@ from ucapi import media_player, api_definitions
 
 log = logging.getLogger(__name__)
 
-class EVENTS(IntEnum):
-    UPDATE = 1
+def _split_command(command: str) -> tuple[str, str]:
+    head, _, rest = command.partition("_")
+    family, _, arg = rest.partition("_")
+    if head != "set" or not arg:
+        return "", ""
+    return family, arg
 
 class HDFuryDevice:
     def __init__(self, host: str, port: int, model_config: ModelConfig):
         self.host, self.port = host, port
         self.model_config = model_config
         self.client = HDFuryClient(host, port, log, model_config)
-        self.events = AsyncIOEventEmitter()
+        self._update_listeners: list[Callable[["HDFuryDevice"], Any]] = []
+        self._listener_tasks: set[asyncio.Task] = set()
 
         self.model: str = model_config.display_name
         self.name: str = f"HDFury {self.model}"
@@ -32,31 +37,53 @@ class HDFuryDevice:
         self.device_id = f"hdfury-{host.replace('.', '-')}" 
         
         self.state: media_player.States = media_player.States.UNAVAILABLE
-        self.source_list: list[str] = get_source_list(model_config)
+        self.source_list: tuple[str, ...] = get_source_list(model_config)
         self.current_source: str | None = None
         self.media_title: str | None = "Ready"
         self.media_artist: str | None = ""
         self.media_album: str | None = ""
         
-        self._keep_alive_task: asyncio.Task | None = None
-        self._last_successful_command: float = 0
-        self._keep_alive_interval: int = 600
+        self._loop = asyncio.get_running_loop()
         
-        self._command_in_progress: bool = False
-        
-        self._command_queue: asyncio.Queue = asyncio.Queue()
-        self._command_processor_task: asyncio.Task | None = None
-        self._last_command_time: float = 0
-        self._min_command_interval: float = 0.5
+        self._command_lock = asyncio.Lock()
+        self._pending_commands: dict[str, list[object]] = {}
+        self._waiting_commands: int = 0
+        self._max_waiting_commands: int = 32
+        self._command_wait_timeout: float = 10.0
+        self._stopping: bool = False
+        # Token bucket: short bursts of up to _token_bucket_size commands go
+        # out back-to-back, the sustained rate is capped at _token_rate/s.
+        self._token_rate: float = 2.0
+        self._token_bucket_size: float = 3.0
+        self._tokens: float = self._token_bucket_size
+        self._last_refill: float = 0
         
         self.media_player_entity = HDFuryMediaPlayer(self)
         self.remote_entity = HDFuryRemote(self)
         
+    def on_update(self, callback: Callable[["HDFuryDevice"], Any]):
+        self._update_listeners.append(callback)
+
+    def off_update(self, callback: Callable[["HDFuryDevice"], Any]):
+        if callback in self._update_listeners:
+            self._update_listeners.remove(callback)
+
+    def emit_update(self):
+        for callback in self._update_listeners:
+            result = callback(self)
+            if inspect.iscoroutine(result):
+                task = self._loop.create_task(result)
+                self._listener_tasks.add(task)
+                task.add_done_callback(self._on_listener_done)
+
+    def _on_listener_done(self, task: asyncio.Task):
+        self._listener_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.error(f"HDFuryDevice: Update listener failed: {task.exception()}")
+
     async def start(self):
         log.info(f"HDFuryDevice: Starting connection for {self.host}")
-        
-        if not self._command_processor_task or self._command_processor_task.done():
-            self._command_processor_task = asyncio.create_task(self._process_command_queue())
+        self._stopping = False
         
         try:
             if not self.client.is_connected(): 
@@ -65,10 +92,6 @@ class HDFuryDevice:
             if self.client.is_connected():
                 self.state = media_player.States.ON
                 self.media_title = "Ready"
-                self._last_successful_command = asyncio.get_event_loop().time()
-                
-                if not self._keep_alive_task or self._keep_alive_task.done():
-                    self._keep_alive_task = asyncio.create_task(self._keep_alive_loop())
             else:
                 raise Exception("Failed to establish connection")
 
@@ -79,192 +102,168 @@ class HDFuryDevice:
             self.media_album = ""
             log.error(f"HDFuryDevice connection error: {e}", exc_info=True)
         
-        self.events.emit(EVENTS.UPDATE, self)
+        self.emit_update()
 
     async def stop(self):
         log.info(f"HDFuryDevice: Stopping connection to {self.host}")
         
-        if self._command_processor_task and not self._command_processor_task.done():
-            self._command_processor_task.cancel()
-            try:
-                await self._command_processor_task
-            except asyncio.CancelledError:
-                pass
-        
-        if self._keep_alive_task and not self._keep_alive_task.done():
-            self._keep_alive_task.cancel()
-            try:
-                await self._keep_alive_task
-            except asyncio.CancelledError:
-                pass
-        
-        if self.client.is_connected(): 
-            await self.client.disconnect()
+        # Let an in-flight command finish so its reply is not lost when the
+        # socket is closed underneath it; commands still waiting for the lock
+        # see _stopping and return without being sent.
+        self._stopping = True
+        async with self._command_lock:
+            if self.client.is_connected(): 
+                await self.client.disconnect()
         self.state = media_player.States.UNAVAILABLE
-        self.events.emit(EVENTS.UPDATE, self)
+        self.emit_update()
 
-    async def _process_command_queue(self):
-        log.info(f"HDFuryDevice: Starting command processor for {self.host}")
+    async def _rate_limit(self):
+        current_time = self._loop.time()
+        elapsed = current_time - self._last_refill
+        self._tokens = min(self._token_bucket_size, self._tokens + elapsed * self._token_rate)
+        self._last_refill = current_time
         
-        while True:
-            try:
-                command_data = await self._command_queue.get()
-                
-                if command_data is None:
-                    break
-                
-                command, future = command_data
-                
-                current_time = asyncio.get_event_loop().time()
-                time_since_last = current_time - self._last_command_time
-                
-                if time_since_last < self._min_command_interval:
-                    sleep_time = self._min_command_interval - time_since_last
-                    log.debug(f"Rate limiting: sleeping {sleep_time:.2f}s before command")
-                    await asyncio.sleep(sleep_time)
-                
-                try:
-                    result = await self._execute_command_internal(command)
-                    future.set_result(result)
-                    self._last_command_time = asyncio.get_event_loop().time()
-                    if result == api_definitions.StatusCodes.OK:
-                        self._last_successful_command = self._last_command_time
-                except Exception as e:
-                    future.set_exception(e)
-                
-                self._command_queue.task_done()
-                
-            except asyncio.CancelledError:
-                log.info(f"HDFuryDevice: Command processor cancelled for {self.host}")
-                break
-            except Exception as e:
-                log.error(f"HDFuryDevice: Command processor error for {self.host}: {e}")
+        if self._tokens < 1:
+            sleep_time = (1 - self._tokens) / self._token_rate
+            log.debug("Rate limiting: sleeping %.2fs before command", sleep_time)
+            await asyncio.sleep(sleep_time)
+            self._last_refill = current_time + sleep_time
+            self._tokens = 0
+        else:
+            self._tokens -= 1
 
-    async def _execute_command_internal(self, command: str):
-        log.debug(f"HDFuryDevice: Executing command '{command}'")
-        
-        try:
-            if command.startswith("set_source_"):
-                source = command.replace("set_source_", "").replace("_", " ")
-                await self.client.set_source(source)
-                self.current_source = source
-                
-            elif command.startswith("set_edidmode_"):
-                mode = command.replace("set_edidmode_", "")
-                await self.client.set_edid_mode(mode)
-                
-            elif command.startswith("set_edidaudio_"):
-                source = command.replace("set_edidaudio_", "")
-                if source == "51":
-                    await self.client.set_edid_audio("5.1")
-                else:
-                    await self.client.set_edid_audio(source)
-                    
-            elif command.startswith("set_hdrcustom_"):
-                state = (command == "set_hdrcustom_on")
-                await self.client.set_hdr_custom(state)
-                
-            elif command.startswith("set_hdrdisable_"):
-                state = (command == "set_hdrdisable_on")
-                await self.client.set_hdr_disable(state)
-                
-            elif command.startswith("set_cec_"):
-                state = (command == "set_cec_on")
-                await self.client.set_cec(state)
-                
-            elif command.startswith("set_earcforce_"):
-                mode = command.replace("set_earcforce_", "")
-                await self.client.set_earc_force(mode)
-                
-            elif command.startswith("set_oled_"):
-                state = (command == "set_oled_on")
-                await self.client.set_oled(state)
-                
-            elif command.startswith("set_autosw_"):
-                state = (command == "set_autosw_on")
-                await self.client.set_autoswitch(state)
-                
-            elif command.startswith("set_hdcp_"):
-                mode = command.replace("set_hdcp_", "")
-                await self.client.set_hdcp_mode(mode)
+    async def _do_source(self, arg: str):
+        source = arg.replace("_", " ")
+        await self.client.set_source(source)
+        self.current_source = source
 
-            elif command.startswith("set_scalemode_"):
-                mode = command.replace("set_scalemode_", "")
-                await self.client.set_scale_mode(mode)
+    async def _do_edidmode(self, arg: str):
+        await self.client.set_edid_mode(arg)
 
-            elif command.startswith("set_audiomode_"):
-                mode = command.replace("set_audiomode_", "")
-                await self.client.set_audio_mode(mode)
+    async def _do_edidaudio(self, arg: str):
+        await self.client.set_edid_audio("5.1" if arg == "51" else arg)
 
-            elif command.startswith("set_ledprofilevideo_"):
-                mode = command.replace("set_ledprofilevideo_", "")
-                await self.client.set_ledprofilevideo_mode(mode)
-                
-            else:
-                log.warning(f"Unsupported command: {command}")
-                return api_definitions.StatusCodes.NOT_IMPLEMENTED
-            
-            return api_definitions.StatusCodes.OK
-            
+    async def _do_hdrcustom(self, arg: str):
+        await self.client.set_hdr_custom(arg == "on")
+
+    async def _do_hdrdisable(self, arg: str):
+        await self.client.set_hdr_disable(arg == "on")
+
+    async def _do_cec(self, arg: str):
+        await self.client.set_cec(arg == "on")
+
+    async def _do_earcforce(self, arg: str):
+        await self.client.set_earc_force(arg)
+
+    async def _do_oled(self, arg: str):
+        await self.client.set_oled(arg == "on")
+
+    async def _do_autosw(self, arg: str):
+        await self.client.set_autoswitch(arg == "on")
+
+    async def _do_hdcp(self, arg: str):
+        await self.client.set_hdcp_mode(arg)
+
+    async def _do_scalemode(self, arg: str):
+        await self.client.set_scale_mode(arg)
+
+    async def _do_audiomode(self, arg: str):
+        await self.client.set_audio_mode(arg)
+
+    async def _do_ledprofilevideo(self, arg: str):
+        await self.client.set_ledprofilevideo_mode(arg)
+
+    _HANDLERS = {
+        "source": _do_source,
+        "edidmode": _do_edidmode,
+        "edidaudio": _do_edidaudio,
+        "hdrcustom": _do_hdrcustom,
+        "hdrdisable": _do_hdrdisable,
+        "cec": _do_cec,
+        "earcforce": _do_earcforce,
+        "oled": _do_oled,
+        "autosw": _do_autosw,
+        "hdcp": _do_hdcp,
+        "scalemode": _do_scalemode,
+        "audiomode": _do_audiomode,
+        "ledprofilevideo": _do_ledprofilevideo,
+    }
+    _KNOWN_FAMILIES = frozenset(_HANDLERS)
+
+    async def _execute_command_internal(self, command: str):
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("HDFuryDevice: Executing command '%s'", command)
+        
+        family, arg = _split_command(command)
+        handler = self._HANDLERS[family]
+        
+        try:
+            await handler(self, arg)
         except Exception as e:
             log.error(f"Error executing command '{command}': {e}", exc_info=True)
+            if not self.client.is_connected() and self.state != media_player.States.UNAVAILABLE:
+                log.warning(f"HDFuryDevice: Connection lost for {self.host}")
+                self.state = media_player.States.UNAVAILABLE
+                self.media_title = "Connection Lost"
+                self.emit_update()
             return api_definitions.StatusCodes.SERVER_ERROR
+        
+        if self.state != media_player.States.ON:
+            log.info(f"HDFuryDevice: Reconnected to {self.host}")
+            self.state = media_player.States.ON
+            self.media_title = "Ready"
+        
+        return api_definitions.StatusCodes.OK
 
     async def _queue_command(self, command: str) -> api_definitions.StatusCodes:
-        future = asyncio.Future()
-        await self._command_queue.put((command, future))
+        family, _ = _split_command(command)
+        if family not in self._KNOWN_FAMILIES:
+            log.warning(f"Unsupported command: {command}")
+            return api_definitions.StatusCodes.NOT_IMPLEMENTED
         
-        try:
-            result = await asyncio.wait_for(future, timeout=10.0)
-            return result
-        except asyncio.TimeoutError:
-            log.error(f"Command '{command}' timed out in queue")
-            return api_definitions.StatusCodes.SERVER_ERROR
-
-    async def _keep_alive_loop(self):
-        log.info(f"HDFuryDevice: Starting keep-alive loop for {self.host}")
+        if self._waiting_commands >= self._max_waiting_commands:
+            log.warning(f"Rejecting command '{command}': {self._waiting_commands} commands already waiting")
+            return api_definitions.StatusCodes.SERVICE_UNAVAILABLE
+        
+        # Each waiter registers a token per family; only the newest live waiter
+        # of a family is sent, older ones are superseded by it.
+        token = object()
+        pending = self._pending_commands.setdefault(family, [])
+        pending.append(token)
+        self._waiting_commands += 1
         
-        while True:
+        try:
             try:
-                await asyncio.sleep(self._keep_alive_interval)
-                
-                if self._command_in_progress or not self._command_queue.empty():
-                    continue
-                
-                current_time = asyncio.get_event_loop().time()
-                time_since_last_command = current_time - self._last_successful_command
-                
-                if time_since_last_command > 1200:
-                    log.debug(f"HDFuryDevice: Connection idle for {time_since_last_command:.0f}s, checking health")
-                    
-                    if not self.client.is_connected():
-                        log.warning(f"HDFuryDevice: Connection lost for {self.host}")
-                        if self.state != media_player.States.UNAVAILABLE:
-                            self.state = media_player.States.UNAVAILABLE
-                            self.media_title = "Connection Lost"
-                            self.events.emit(EVENTS.UPDATE, self)
-                        
-                        try:
-                            await self.client.connect()
-                            if self.client.is_connected():
-                                self.state = media_player.States.ON
-                                self.media_title = "Ready"
-                                self._last_successful_command = current_time
-                                self.events.emit(EVENTS.UPDATE, self)
-                                log.info(f"HDFuryDevice: Reconnected to {self.host}")
-                        except Exception as e:
-                            log.warning(f"HDFuryDevice: Reconnection failed for {self.host}: {e}")
-                    
-            except asyncio.CancelledError:
-                log.info(f"HDFuryDevice: Keep-alive loop cancelled for {self.host}")
-                break
-            except Exception as e:
-                log.error(f"HDFuryDevice: Keep-alive error for {self.host}: {e}")
+                await asyncio.wait_for(self._command_lock.acquire(), timeout=self._command_wait_timeout)
+            except asyncio.TimeoutError:
+                log.error(f"Command '{command}' timed out waiting for the device")
+                return api_definitions.StatusCodes.SERVER_ERROR
+            
+            try:
+                if self._stopping:
+                    log.debug("Dropping command '%s', device is stopping", command)
+                    return api_definitions.StatusCodes.SERVICE_UNAVAILABLE
+                if pending[-1] is not token:
+                    log.debug("Skipping command '%s', superseded by a newer %s command", command, family)
+                    return api_definitions.StatusCodes.OK
                 
-                try:
-                    await asyncio.sleep(60)
-                except asyncio.CancelledError:
-                    break
+                await self._rate_limit()
+                return await self._execute_command_internal(command)
+            finally:
+                self._command_lock.release()
+        finally:
+            self._waiting_commands -= 1
+            pending.remove(token)
+            if not pending:
+                del self._pending_commands[family]
+
+    async def select_source(self, source: str) -> api_definitions.StatusCodes:
+        result = await self._queue_command(f"set_source_{source.replace(' ', '_')}")
+        
+        if result == api_definitions.StatusCodes.OK:
+            self.emit_update()
+        
+        return result
 
     async def handle_remote_command(self, entity, cmd_id, kwargs):
         if kwargs is None:
@@ -282,6 +281,6 @@ class HDFuryDevice:
         result = await self._queue_command(actual_cmd)
         
         if result == api_definitions.StatusCodes.OK:
-            self.events.emit(EVENTS.UPDATE, self)
+            self.emit_update()
         
         return result
\ No newline at end of file
@@ -9,7 +9,7 @@ import logging
 import ucapi
 from ucapi import media_player, DeviceStates, api_definitions
 from ucapi.remote import States as RemoteStates
-from uc_intg_hdfury.device import HDFuryDevice, EVENTS
+from uc_intg_hdfury.device import HDFuryDevice
 from uc_intg_hdfury.config import Devices, HDFuryDeviceConfig
 from uc_intg_hdfury.hdfury_client import HDFuryClient
 from uc_intg_hdfury.models import MODEL_CONFIGS, get_model_config
@@ -83,7 +83,7 @@ async def driver_setup_handler(request: ucapi.SetupDriver) -> ucapi.SetupAction:
         
         api.available_entities.add(device.media_player_entity)
         api.available_entities.add(device.remote_entity)
-        device.events.on(EVENTS.UPDATE, on_device_update)
+        device.on_update(on_device_update)
 
         try:
             await asyncio.wait_for(device.start(), timeout=15.0)
@@ -156,7 +156,7 @@ def add_device(device_config: HDFuryDeviceConfig):
     
     api.available_entities.add(device.media_player_entity)
     api.available_entities.add(device.remote_entity)
-    device.events.on(EVENTS.UPDATE, on_device_update)
+    device.on_update(on_device_update)
     configured_devices[identifier] = device
 
 async def cleanup_on_shutdown():
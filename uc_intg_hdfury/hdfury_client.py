@@ -6,6 +6,7 @@ HDFury Integration for Unfolded Circle Remote Two/3.
 """
 import asyncio
 import logging
+import socket
 from uc_intg_hdfury.models import ModelConfig, format_source_for_command
 
 class HDFuryClient:
@@ -14,33 +15,65 @@ class HDFuryClient:
         self.model_config = model_config
         self._reader: asyncio.StreamReader | None = None
         self._writer: asyncio.StreamWriter | None = None
+        # Single lock for the connection: it guards both (re)connecting and
+        # the write/readline exchange, so the two can never interleave.
         self._lock = asyncio.Lock()
-        self._connection_lock = asyncio.Lock()
-        self._last_activity = 0.0
+        
+        # model_config is fixed for the life of the client, so resolve the
+        # model-specific command prefixes and on/off toggles once up front.
+        if model_config.model_id == "vertex":
+            self._source_prefix = b"set input "
+        elif model_config.source_command:
+            self._source_prefix = f"set {model_config.source_command} ".encode('ascii')
+        else:
+            self._source_prefix = None
+        self._scale_prefix = b"set scalemode " if model_config.model_id == "arcana2" else b"set scale "
+        self._toggle_commands = {
+            name: (f"set {name} off".encode('ascii'), f"set {name} on".encode('ascii'))
+            for name in ("hdrcustom", "hdrdisable", "cec", "oled", "autosw")
+        }
 
     def is_connected(self) -> bool:
         return self._writer is not None and not self._writer.is_closing()
 
     async def connect(self):
-        async with self._connection_lock:
-            if self.is_connected():
-                return
-            self.log.info(f"HDFuryClient: Connecting to {self.host}:{self.port}")
-            try:
-                self._reader, self._writer = await asyncio.wait_for(
-                    asyncio.open_connection(self.host, self.port), timeout=10.0)
+        async with self._lock:
+            await self._ensure_connection()
+
+    async def _open_connection(self):
+        self.log.info(f"HDFuryClient: Connecting to {self.host}:{self.port}")
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), timeout=10.0)
+            self._enable_keepalive()
+            for _ in range(4):
                 try:
-                    await asyncio.wait_for(self._reader.read(2048), timeout=1.0)
+                    if not await asyncio.wait_for(self._reader.read(2048), timeout=0.05):
+                        break
                     self.log.debug("HDFuryClient: Cleared welcome message from buffer.")
                 except asyncio.TimeoutError:
-                    pass
-                
-                self._last_activity = asyncio.get_event_loop().time()
-                self.log.info(f"HDFuryClient: Connected successfully.")
-            except Exception as e:
-                self.log.error(f"HDFuryClient: Connection failed: {e}")
-                await self.disconnect()
-                raise
+                    break
+            
+            self.log.info(f"HDFuryClient: Connected successfully.")
+        except Exception as e:
+            self.log.error(f"HDFuryClient: Connection failed: {e}")
+            await self.disconnect()
+            raise
+
+    def _enable_keepalive(self):
+        sock = self._writer.get_extra_info("socket")
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+            if hasattr(socket, "TCP_KEEPINTVL"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+            if hasattr(socket, "TCP_KEEPCNT"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+        except OSError as e:
+            self.log.debug("HDFuryClient: Could not enable TCP keepalive: %s", e)
 
     async def disconnect(self):
         if not self._writer:
@@ -50,123 +83,117 @@ class HDFuryClient:
         try:
             await self._writer.wait_closed()
         except Exception as e:
-            self.log.debug(f"HDFuryClient: Error during disconnect: {e}")
+            self.log.debug("HDFuryClient: Error during disconnect: %s", e)
         finally:
             self._writer = self._reader = None
 
     async def _ensure_connection(self):
-        current_time = asyncio.get_event_loop().time()
-        time_since_activity = current_time - self._last_activity
-        
-        if time_since_activity > 600:
-            self.log.info(f"HDFuryClient: Proactive reconnect after {time_since_activity:.0f}s inactivity")
-            await self.disconnect()
-        
         if not self.is_connected():
-            await self.connect()
+            await self._open_connection()
 
-    def _get_command_timeout(self, command: str) -> float:
-        if "set" in command:
+    def _get_command_timeout(self, command: bytes) -> float:
+        if b"set" in command:
             return 8.0
         else:
             return 5.0
 
-    async def send_command(self, command: str, is_retry: bool = False) -> str:
+    async def send_command(self, command: str | bytes) -> str:
+        if isinstance(command, str):
+            command = command.encode('ascii')
         async with self._lock:
-            try:
-                await self._ensure_connection()
-                
-                timeout = self._get_command_timeout(command)
-                
-                self.log.debug(f"HDFuryClient: Sending command '{command}' (timeout: {timeout}s)")
-                self._writer.write(f"{command}\r\n".encode('ascii'))
-                await self._writer.drain()
-
-                response = await asyncio.wait_for(self._reader.readline(), timeout=timeout)
-                decoded = response.decode('ascii').replace('>', '').strip()
-                self._last_activity = asyncio.get_event_loop().time()
-                self.log.debug(f"HDFuryClient: Received response for '{command}': '{decoded}'")
-                return decoded
-
-            except asyncio.TimeoutError:
-                self.log.warning(f"Command '{command}' timed out after {timeout}s - connection may be stale")
-                await self.disconnect()
-                
-                if not is_retry:
-                    self.log.info(f"Retrying command '{command}' after timeout")
-                    return await self.send_command(command, is_retry=True)
-                else:
-                    self.log.error(f"Command '{command}' failed on retry after timeout")
-                    raise asyncio.TimeoutError(f"Command '{command}' timed out on retry")
-
-            except (ConnectionResetError, BrokenPipeError, ConnectionError, OSError) as e:
-                await self.disconnect()
-                if is_retry:
-                    self.log.error(f"HDFuryClient: Command '{command}' failed on retry. Giving up. Error: {e}")
-                    raise
-                self.log.warning(f"HDFuryClient: Command '{command}' failed: {e}. Retrying once.")
-                return await self.send_command(command, is_retry=True)
-
-            except Exception as e:
-                self.log.error(f"HDFuryClient: An unexpected error occurred for command '{command}': {e}", exc_info=True)
-                await self.disconnect()
+            return await self._send_command(command)
+
+    async def _send_command(self, command: bytes, is_retry: bool = False) -> str:
+        timeout = self._get_command_timeout(command)
+        
+        try:
+            await self._ensure_connection()
+            
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug("HDFuryClient: Sending command %r (timeout: %ss)", command, timeout)
+            self._writer.writelines((command, b"\r\n"))
+            await self._writer.drain()
+
+            response = await asyncio.wait_for(self._reader.readline(), timeout=timeout)
+            decoded = response.translate(None, b'>').strip().decode('ascii')
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug("HDFuryClient: Received response for %r: '%s'", command, decoded)
+            return decoded
+
+        except asyncio.TimeoutError:
+            self.log.warning(f"Command {command!r} timed out after {timeout}s - connection may be stale")
+            await self.disconnect()
+            
+            if not is_retry:
+                self.log.info(f"Retrying command {command!r} after timeout")
+                return await self._send_command(command, is_retry=True)
+            else:
+                self.log.error(f"Command {command!r} failed on retry after timeout")
+                raise asyncio.TimeoutError(f"Command {command!r} timed out on retry")
+
+        except (ConnectionResetError, BrokenPipeError, ConnectionError, OSError) as e:
+            await self.disconnect()
+            if is_retry:
+                self.log.error(f"HDFuryClient: Command {command!r} failed on retry. Giving up. Error: {e}")
                 raise
+            self.log.warning(f"HDFuryClient: Command {command!r} failed: {e}. Retrying once.")
+            return await self._send_command(command, is_retry=True)
+
+        except Exception as e:
+            self.log.error(f"HDFuryClient: An unexpected error occurred for command {command!r}: {e}", exc_info=True)
+            await self.disconnect()
+            raise
 
     async def set_source(self, source: str):
-        formatted_source = format_source_for_command(source, self.model_config)
-        if self.model_config.model_id == "vertex":
-            await self.send_command(f"set input {formatted_source}")
-        elif self.model_config.source_command:
-            await self.send_command(f"set {self.model_config.source_command} {formatted_source}")
+        if self._source_prefix:
+            formatted_source = format_source_for_command(source, self.model_config)
+            await self.send_command(self._source_prefix + formatted_source.encode('ascii'))
 
     async def set_edid_mode(self, mode: str):
-        await self.send_command(f"set edidmode {mode}")
+        await self.send_command(b"set edidmode " + mode.encode('ascii'))
 
     async def set_edid_audio(self, source: str):
-        await self.send_command(f"set edid audio {source}")
+        await self.send_command(b"set edid audio " + source.encode('ascii'))
 
     async def set_hdr_custom(self, state: bool):
-        await self.send_command(f"set hdrcustom {'on' if state else 'off'}")
+        await self.send_command(self._toggle_commands["hdrcustom"][state])
 
     async def set_hdr_disable(self, state: bool):
-        await self.send_command(f"set hdrdisable {'on' if state else 'off'}")
+        await self.send_command(self._toggle_commands["hdrdisable"][state])
 
     async def set_cec(self, state: bool):
-        await self.send_command(f"set cec {'on' if state else 'off'}")
+        await self.send_command(self._toggle_commands["cec"][state])
 
     async def set_earc_force(self, mode: str):
-        await self.send_command(f"set earcforce {mode}")
+        await self.send_command(b"set earcforce " + mode.encode('ascii'))
 
     async def set_oled(self, state: bool):
-        await self.send_command(f"set oled {'on' if state else 'off'}")
+        await self.send_command(self._toggle_commands["oled"][state])
 
     async def set_autoswitch(self, state: bool):
-        await self.send_command(f"set autosw {'on' if state else 'off'}")
+        await self.send_command(self._toggle_commands["autosw"][state])
 
     async def set_hdcp_mode(self, mode: str):
         if mode == "14":
             mode = "1.4"
-        await self.send_command(f"set hdcp {mode}")
+        await self.send_command(b"set hdcp " + mode.encode('ascii'))
 
     async def set_scale_mode(self, mode: str):
-        if self.model_config.model_id == "arcana2":
-            await self.send_command(f"set scalemode {mode}")
-        else:
-            await self.send_command(f"set scale {mode}")
+        await self.send_command(self._scale_prefix + mode.encode('ascii'))
 
     async def set_audio_mode(self, mode: str):
-        await self.send_command(f"set audiomode {mode}")
+        await self.send_command(b"set audiomode " + mode.encode('ascii'))
 
     async def set_ledprofilevideo_mode(self, mode: str):
-        await self.send_command(f"set ledprofilevideo {mode}")
+        await self.send_command(b"set ledprofilevideo " + mode.encode('ascii'))
 
     async def heartbeat(self) -> bool:
         try:
             if self.model_config.input_count > 0:
-                await self.send_command("get insel")
+                await self.send_command(b"get insel")
             else:
-                await self.send_command("get ver")
+                await self.send_command(b"get ver")
             return True
         except Exception as e:
-            self.log.debug(f"Heartbeat failed: {e}")
+            self.log.debug("Heartbeat failed: %s", e)
             return False
\ No newline at end of file
@@ -37,18 +37,13 @@ class HDFuryMediaPlayer(media_player.MediaPlayer):
         )
 
     async def handle_command(self, entity_arg: entity.Entity, command: str, kwargs: dict[str, Any]) -> api_definitions.StatusCodes:
-        log.debug(f"HDFuryMediaPlayer received command: {command}")
-        
-        from uc_intg_hdfury.device import EVENTS
+        log.debug("HDFuryMediaPlayer received command: %s", command)
         
         try:
             if command == media_player.Commands.SELECT_SOURCE:
                 source = kwargs.get("source")
                 if source and source in self._device.source_list:
-                    await self._device.client.set_source(source)
-                    self._device.current_source = source
-                    self._device.events.emit(EVENTS.UPDATE, self._device)
-                    return api_definitions.StatusCodes.OK
+                    return await self._device.select_source(source)
                 else:
                     log.warning(f"Invalid source requested: {source}")
                     return api_definitions.StatusCodes.BAD_REQUEST
@@ -60,10 +55,7 @@ class HDFuryMediaPlayer(media_player.MediaPlayer):
                 for source in self._device.source_list:
                     source_cmd = source.replace(" ", "_")
                     if command == source_cmd:
-                        await self._device.client.set_source(source)
-                        self._device.current_source = source
-                        self._device.events.emit(EVENTS.UPDATE, self._device)
-                        return api_definitions.StatusCodes.OK
+                        return await self._device.select_source(source)
                 
                 log.warning(f"Received unhandled command: {command}")
                 return api_definitions.StatusCodes.NOT_IMPLEMENTED
@@ -4,28 +4,52 @@ HDFury Integration for Unfolded Circle Remote Two/3.
 :copyright: (c) 2025 by Meir Miyara.
 :license: MPL-2.0, see LICENSE for more details.
 """
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ModelConfig:
     model_id: str
     display_name: str
     default_port: int
     input_count: int
     source_command: str
-    edid_modes: List[str]
-    edid_audio_sources: List[str]
+    edid_modes: Tuple[str, ...]
+    edid_audio_sources: Tuple[str, ...]
     hdr_custom_support: bool
     hdr_disable_support: bool
     cec_support: bool
-    earc_force_modes: List[str]
+    earc_force_modes: Tuple[str, ...]
     oled_support: bool
     autoswitch_support: bool
-    hdcp_modes: List[str]
-    scale_modes: Optional[List[str]] = None
-    audio_modes: Optional[List[str]] = None
-    led_modes: Optional[List[str]] = None
+    hdcp_modes: Tuple[str, ...]
+    scale_modes: Optional[Tuple[str, ...]] = None
+    audio_modes: Optional[Tuple[str, ...]] = None
+    led_modes: Optional[Tuple[str, ...]] = None
+    edid_mode_cmd_ids: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    edid_audio_cmd_ids: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    scale_cmd_ids: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    audio_cmd_ids: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    led_cmd_ids: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    earc_force_cmd_ids: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    hdcp_cmd_ids: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        cmd_ids = {
+            "edid_mode_cmd_ids": tuple(f"set_edidmode_{mode}" for mode in self.edid_modes),
+            "edid_audio_cmd_ids": tuple(
+                f"set_edidaudio_{source.replace('.', '')}" for source in self.edid_audio_sources
+            ),
+            "scale_cmd_ids": tuple(f"set_scalemode_{mode}" for mode in self.scale_modes or ()),
+            "audio_cmd_ids": tuple(f"set_audiomode_{mode}" for mode in self.audio_modes or ()),
+            "led_cmd_ids": tuple(f"set_ledprofilevideo_{mode}" for mode in self.led_modes or ()),
+            "earc_force_cmd_ids": tuple(f"set_earcforce_{mode}" for mode in self.earc_force_modes),
+            "hdcp_cmd_ids": tuple(
+                f"set_hdcp_{'14' if mode == '1.4' else mode}" for mode in self.hdcp_modes
+            ),
+        }
+        for name, value in cmd_ids.items():
+            object.__setattr__(self, name, value)
 
 VRROOM_CONFIG = ModelConfig(
     model_id="vrroom",
@@ -33,15 +57,15 @@ VRROOM_CONFIG = ModelConfig(
     default_port=2222,
     input_count=4,
     source_command="inseltx0",
-    edid_modes=["automix", "custom", "fixed", "copytx0", "copytx1"],
-    edid_audio_sources=["stereo", "5.1", "full", "audioout", "earcout"],
+    edid_modes=("automix", "custom", "fixed", "copytx0", "copytx1"),
+    edid_audio_sources=("stereo", "5.1", "full", "audioout", "earcout"),
     hdr_custom_support=True,
     hdr_disable_support=True,
     cec_support=True,
-    earc_force_modes=["auto", "earc", "hdmi"],
+    earc_force_modes=("auto", "earc", "hdmi"),
     oled_support=True,
     autoswitch_support=True,
-    hdcp_modes=["auto", "1.4"],
+    hdcp_modes=("auto", "1.4"),
 )
 
 VERTEX2_CONFIG = ModelConfig(
@@ -50,16 +74,16 @@ VERTEX2_CONFIG = ModelConfig(
     default_port=2220,
     input_count=4,
     source_command="inseltx0",
-    edid_modes=["automix", "custom", "fixed", "copytx0", "copytx1"],
-    edid_audio_sources=["stereo", "5.1", "full", "native", "tx1"],
+    edid_modes=("automix", "custom", "fixed", "copytx0", "copytx1"),
+    edid_audio_sources=("stereo", "5.1", "full", "native", "tx1"),
     hdr_custom_support=True,
     hdr_disable_support=True,
     cec_support=True,
-    earc_force_modes=["auto", "earc", "hdmi"],
+    earc_force_modes=("auto", "earc", "hdmi"),
     oled_support=True,
     autoswitch_support=True,
-    hdcp_modes=["auto", "1.4"],
-    scale_modes=["auto", "custom", "none"],
+    hdcp_modes=("auto", "1.4"),
+    scale_modes=("auto", "custom", "none"),
 )
 
 VERTEX_CONFIG = ModelConfig(
@@ -68,16 +92,16 @@ VERTEX_CONFIG = ModelConfig(
     default_port=2220,
     input_count=2,
     source_command="input",
-    edid_modes=["automix", "custom", "fixed", "copytop", "copybot"],
-    edid_audio_sources=["stereo", "5.1", "7.1", "native", "top"],
+    edid_modes=("automix", "custom", "fixed", "copytop", "copybot"),
+    edid_audio_sources=("stereo", "5.1", "7.1", "native", "top"),
     hdr_custom_support=True,
     hdr_disable_support=True,
     cec_support=True,
-    earc_force_modes=[],
+    earc_force_modes=(),
     oled_support=True,
     autoswitch_support=True,
-    hdcp_modes=["1.4", "2.2"],
-    scale_modes=["auto", "custom", "none"],
+    hdcp_modes=("1.4", "2.2"),
+    scale_modes=("auto", "custom", "none"),
 )
 
 DIVA_CONFIG = ModelConfig(
@@ -86,17 +110,17 @@ DIVA_CONFIG = ModelConfig(
     default_port=2210,
     input_count=4,
     source_command="inseltx0",
-    edid_modes=["automix", "custom", "fixed", "copytx0", "copytx1"],
-    edid_audio_sources=["stereo", "5.1", "full", "native", "tx1"],
+    edid_modes=("automix", "custom", "fixed", "copytx0", "copytx1"),
+    edid_audio_sources=("stereo", "5.1", "full", "native", "tx1"),
     hdr_custom_support=True,
     hdr_disable_support=True,
     cec_support=True,
-    earc_force_modes=["auto", "earc", "hdmi"],
+    earc_force_modes=("auto", "earc", "hdmi"),
     oled_support=True,
     autoswitch_support=True,
-    hdcp_modes=["auto", "1.4"],
-    scale_modes=["auto", "custom", "none"],
-    led_modes=["0","1","2","3","4"],
+    hdcp_modes=("auto", "1.4"),
+    scale_modes=("auto", "custom", "none"),
+    led_modes=("0","1","2","3","4"),
 )
 
 MAESTRO_CONFIG = ModelConfig(
@@ -105,16 +129,16 @@ MAESTRO_CONFIG = ModelConfig(
     default_port=2200,
     input_count=4,
     source_command="inseltx0",
-    edid_modes=["automix", "custom", "fixed", "copytx0", "copytx1"],
-    edid_audio_sources=["stereo", "5.1", "full", "native", "tx1"],
+    edid_modes=("automix", "custom", "fixed", "copytx0", "copytx1"),
+    edid_audio_sources=("stereo", "5.1", "full", "native", "tx1"),
     hdr_custom_support=True,
     hdr_disable_support=True,
     cec_support=True,
-    earc_force_modes=["auto", "earc", "hdmi"],
+    earc_force_modes=("auto", "earc", "hdmi"),
     oled_support=True,
     autoswitch_support=True,
-    hdcp_modes=["auto", "1.4"],
-    scale_modes=["auto", "custom", "none"],
+    hdcp_modes=("auto", "1.4"),
+    scale_modes=("auto", "custom", "none"),
 )
 
 ARCANA2_CONFIG = ModelConfig(
@@ -123,17 +147,17 @@ ARCANA2_CONFIG = ModelConfig(
     default_port=2222,
     input_count=1,
     source_command="",
-    edid_modes=[],
-    edid_audio_sources=[],
+    edid_modes=(),
+    edid_audio_sources=(),
     hdr_custom_support=True,
     hdr_disable_support=False,
     cec_support=False,
-    earc_force_modes=["autoearc", "manualearc", "autoarc", "manualarc", "hdmi"],
+    earc_force_modes=("autoearc", "manualearc", "autoarc", "manualarc", "hdmi"),
     oled_support=True,
     autoswitch_support=False,
-    hdcp_modes=[],
-    scale_modes=["none", "downtx1", "frltmds", "audioonly", "4k60_444_8_lldv", "4k60_444_8_hdr", "4k60_444_8_sdr"],
-    audio_modes=["display", "earc", "both"],
+    hdcp_modes=(),
+    scale_modes=("none", "downtx1", "frltmds", "audioonly", "4k60_444_8_lldv", "4k60_444_8_hdr", "4k60_444_8_sdr"),
+    audio_modes=("display", "earc", "both"),
 )
 
 DR8K_CONFIG = ModelConfig(
@@ -142,15 +166,15 @@ DR8K_CONFIG = ModelConfig(
     default_port=2201,
     input_count=1,
     source_command="",
-    edid_modes=["automix", "custom", "fixed", "copytx"],
-    edid_audio_sources=["stereo", "5.1", "full", "custom"],
+    edid_modes=("automix", "custom", "fixed", "copytx"),
+    edid_audio_sources=("stereo", "5.1", "full", "custom"),
     hdr_custom_support=False,
     hdr_disable_support=False,
     cec_support=False,
-    earc_force_modes=[],
+    earc_force_modes=(),
     oled_support=True,
     autoswitch_support=False,
-    hdcp_modes=[],
+    hdcp_modes=(),
 )
 
 MODEL_CONFIGS: Dict[str, ModelConfig] = {
@@ -166,13 +190,23 @@ MODEL_CONFIGS: Dict[str, ModelConfig] = {
 def get_model_config(model_id: str) -> ModelConfig:
     return MODEL_CONFIGS.get(model_id, VRROOM_CONFIG)
 
-def get_source_list(model_config: ModelConfig) -> List[str]:
+def _build_source_list(model_config: ModelConfig) -> Tuple[str, ...]:
     if model_config.input_count == 0:
-        return []
+        return ()
     elif model_config.input_count == 2:
-        return ["Top", "Bottom"]
+        return ("Top", "Bottom")
     else:
-        return [f"HDMI {i}" for i in range(model_config.input_count)]
+        return tuple(f"HDMI {i}" for i in range(model_config.input_count))
+
+_SOURCE_LIST_CACHE: Dict[str, Tuple[str, ...]] = {
+    model_id: _build_source_list(config) for model_id, config in MODEL_CONFIGS.items()
+}
+
+def get_source_list(model_config: ModelConfig) -> Tuple[str, ...]:
+    source_list = _SOURCE_LIST_CACHE.get(model_config.model_id)
+    if source_list is None:
+        source_list = _build_source_list(model_config)
+    return source_list
 
 def format_source_for_command(source: str, model_config: ModelConfig) -> str:
     if model_config.model_id == "vertex":
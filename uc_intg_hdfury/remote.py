@@ -5,20 +5,51 @@ HDFury Integration for Unfolded Circle Remote Two/3.
 :license: MPL-2.0, see LICENSE for more details.
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from itertools import chain
+from typing import TYPE_CHECKING, Any
 from ucapi import Remote
 from ucapi.remote import States
-from ucapi.ui import UiPage, Size, create_ui_text, EntityCommand
+from ucapi.ui import UiItem, UiPage, Size, create_ui_text, EntityCommand
 
 if TYPE_CHECKING:
     from uc_intg_hdfury.device import HDFuryDevice
 
+# UI pages and simple commands only depend on the (frozen) model config and
+# source list, so devices of the same model share one build. Remote copies
+# the pages into plain dicts, so sharing the objects is safe.
+_UI_CACHE: dict[Any, tuple[list[str], list[UiPage]]] = {}
+_CMD_PARAMS_CACHE: dict[str, dict[str, str]] = {}
+
+_SIZE_W2 = Size(width=2)
+_SIZE_W4 = Size(width=4)
+_SIZE_W5 = Size(width=5)
+_GRID_5X6 = Size(width=5, height=6)
+
+_LED_MODE_TEXT = {
+    "0": "Off",
+    "1": "Video",
+    "2": "Static",
+    "3": "Blink",
+    "4": "Rotate"
+}
+
+def _cmd(cmd_id: str) -> EntityCommand:
+    return EntityCommand(cmd_id, _CMD_PARAMS_CACHE.setdefault(cmd_id, {"command": cmd_id}))
+
+def _ui_row(cmds: list[tuple[str, str]], y: int) -> list[UiItem]:
+    return [create_ui_text(text=label, x=i, y=y, cmd=_cmd(cmd_id)) for i, (label, cmd_id) in enumerate(cmds)]
+
 class HDFuryRemote(Remote):
+    __slots__ = ("_device",)
+
     def __init__(self, device: HDFuryDevice):
         self._device = device
         
-        ui_pages = self._build_ui_pages()
-        simple_commands = self._build_simple_commands()
+        cache_key = (device.model_config, device.source_list)
+        cached = _UI_CACHE.get(cache_key)
+        if cached is None:
+            cached = _UI_CACHE[cache_key] = self._build_commands_and_pages()
+        simple_commands, ui_pages = cached
         
         super().__init__(
             identifier=f"{device.device_id}-remote",
@@ -30,232 +61,132 @@ class HDFuryRemote(Remote):
             ui_pages=ui_pages
         )
 
-    def _build_simple_commands(self) -> list[str]:
-        """Build list of simple command IDs for activity mapping."""
-        commands = []
+    def _build_commands_and_pages(self) -> tuple[list[str], list[UiPage]]:
+        """Build simple command IDs and UI pages in a single pass over the model config."""
         model_config = self._device.model_config
         
         # Source selection commands
-        if model_config.input_count > 0:
-            for source in self._device.source_list:
-                cmd_id = f"set_source_{source.replace(' ', '_')}"
-                commands.append(cmd_id)
+        source_cmds = [
+            (source, f"set_source_{source.replace(' ', '_')}") for source in self._device.source_list
+        ]
         
         # EDID mode commands
-        for mode in model_config.edid_modes:
-            commands.append(f"set_edidmode_{mode}")
+        edid_mode_cmds = [
+            (mode.title(), cmd_id) for mode, cmd_id in zip(model_config.edid_modes, model_config.edid_mode_cmd_ids)
+        ]
         
         # EDID audio source commands
-        for source in model_config.edid_audio_sources:
-            cmd_id = f"set_edidaudio_{source.replace('.', '')}"
-            commands.append(cmd_id)
+        edid_audio_cmds = [
+            ("5.1" if source == "5.1" else source.title(), cmd_id)
+            for source, cmd_id in zip(model_config.edid_audio_sources, model_config.edid_audio_cmd_ids)
+        ]
         
         # Scale mode commands
-        if model_config.scale_modes:
-            for mode in model_config.scale_modes:
-                commands.append(f"set_scalemode_{mode}")
+        scale_cmds = [
+            (mode.replace("_", " ").title(), cmd_id)
+            for mode, cmd_id in zip(model_config.scale_modes or (), model_config.scale_cmd_ids)
+        ]
         
         # Audio mode commands
-        if model_config.audio_modes:
-            for mode in model_config.audio_modes:
-                commands.append(f"set_audiomode_{mode}")
+        audio_cmds = [
+            (mode.title(), cmd_id) for mode, cmd_id in zip(model_config.audio_modes or (), model_config.audio_cmd_ids)
+        ]
 
         # Led mode commands
-        if model_config.led_modes:
-            for mode in model_config.led_modes:
-                commands.append(f"set_ledprofilevideo_{mode}")
-        
-        # HDR custom commands
-        if model_config.hdr_custom_support:
-            commands.extend([
-                "set_hdrcustom_on",
-                "set_hdrcustom_off"
-            ])
-        
-        # HDR disable commands
-        if model_config.hdr_disable_support:
-            commands.extend([
-                "set_hdrdisable_on",
-                "set_hdrdisable_off"
-            ])
-        
-        # CEC engine commands
-        if model_config.cec_support:
-            commands.extend([
-                "set_cec_on",
-                "set_cec_off"
-            ])
+        led_cmds = [
+            (_LED_MODE_TEXT.get(mode, mode.title()), cmd_id)
+            for mode, cmd_id in zip(model_config.led_modes or (), model_config.led_cmd_ids)
+        ]
         
         # eARC force mode commands
-        for mode in model_config.earc_force_modes:
-            commands.append(f"set_earcforce_{mode}")
-        
-        # OLED display commands
-        if model_config.oled_support:
-            commands.extend([
-                "set_oled_on",
-                "set_oled_off"
-            ])
-        
-        # Autoswitch commands
-        if model_config.autoswitch_support:
-            commands.extend([
-                "set_autosw_on",
-                "set_autosw_off"
-            ])
+        earc_cmds = [
+            (mode.title(), cmd_id)
+            for mode, cmd_id in zip(model_config.earc_force_modes, model_config.earc_force_cmd_ids)
+        ]
         
         # HDCP mode commands
-        for mode in model_config.hdcp_modes:
-            cmd_id = f"set_hdcp_{'14' if mode == '1.4' else mode}"
-            commands.append(cmd_id)
+        hdcp_cmds = [
+            (mode, cmd_id) for mode, cmd_id in zip(model_config.hdcp_modes, model_config.hdcp_cmd_ids)
+        ]
+        
+        commands = list(chain(
+            (cmd_id for _, cmd_id in source_cmds),
+            model_config.edid_mode_cmd_ids,
+            model_config.edid_audio_cmd_ids,
+            model_config.scale_cmd_ids,
+            model_config.audio_cmd_ids,
+            model_config.led_cmd_ids,
+            ("set_hdrcustom_on", "set_hdrcustom_off") if model_config.hdr_custom_support else (),
+            ("set_hdrdisable_on", "set_hdrdisable_off") if model_config.hdr_disable_support else (),
+            ("set_cec_on", "set_cec_off") if model_config.cec_support else (),
+            model_config.earc_force_cmd_ids,
+            ("set_oled_on", "set_oled_off") if model_config.oled_support else (),
+            ("set_autosw_on", "set_autosw_off") if model_config.autoswitch_support else (),
+            model_config.hdcp_cmd_ids,
+        ))
         
-        return commands
-
-    def _build_ui_pages(self) -> list[UiPage]:
         pages = []
-        model_config = self._device.model_config
         
         if model_config.input_count > 0:
-            pages.append(self._create_sources_page())
+            pages.append(self._create_sources_page(source_cmds))
         
         if model_config.edid_modes:
-            pages.append(self._create_edid_page())
+            pages.append(self._create_edid_page(edid_mode_cmds, edid_audio_cmds))
         
         if model_config.scale_modes:
-            pages.append(self._create_scale_page())
+            pages.append(self._create_scale_page(scale_cmds))
         
         if model_config.audio_modes:
-            pages.append(self._create_audio_page())
+            pages.append(self._create_audio_page(audio_cmds))
         
         if model_config.hdr_custom_support or model_config.hdr_disable_support:
             pages.append(self._create_hdr_page())
         
         if model_config.cec_support or model_config.earc_force_modes:
-            pages.append(self._create_cec_earc_page())
+            pages.append(self._create_cec_earc_page(earc_cmds))
         
         if model_config.oled_support or model_config.autoswitch_support or model_config.hdcp_modes:
-            pages.append(self._create_system_page())
+            pages.append(self._create_system_page(hdcp_cmds))
 
         if model_config.led_modes:
-            pages.append(self._create_led_page())
+            pages.append(self._create_led_page(led_cmds))
         
-        return pages
+        return commands, pages
 
-    def _create_sources_page(self) -> UiPage:
-        items = [create_ui_text(text="Select Input", x=0, y=0, size=Size(width=4))]
-        
-        for i, source in enumerate(self._device.source_list):
-            cmd_id = f"set_source_{source.replace(' ', '_')}"
-            items.append(create_ui_text(
-                text=source, 
-                x=i, 
-                y=1, 
-                cmd=EntityCommand(cmd_id, {"command": cmd_id})
-            ))
+    def _create_sources_page(self, source_cmds: list[tuple[str, str]]) -> UiPage:
+        items = [create_ui_text(text="Select Input", x=0, y=0, size=_SIZE_W4)]
+        items.extend(_ui_row(source_cmds, 1))
         
         return UiPage(page_id="sources", name="Sources", items=items)
 
-    def _create_edid_page(self) -> UiPage:
-        items = []
-        y_pos = 0
-        model_config = self._device.model_config
+    def _create_edid_page(
+        self, edid_mode_cmds: list[tuple[str, str]], edid_audio_cmds: list[tuple[str, str]]
+    ) -> UiPage:
+        items = [create_ui_text(text="EDID Mode", x=0, y=0, size=_SIZE_W5)]
+        items.extend(_ui_row(edid_mode_cmds[:5], 1))
 
-        items.append(create_ui_text(text="EDID Mode", x=0, y=y_pos, size=Size(width=5)))
-        y_pos += 1
-        for i, mode in enumerate(model_config.edid_modes[:5]):
-            cmd_id = f"set_edidmode_{mode}"
-            items.append(create_ui_text(
-                text=mode.title(), 
-                x=i, 
-                y=y_pos, 
-                cmd=EntityCommand(cmd_id, {"command": cmd_id})
-            ))
-        y_pos += 2
+        if edid_audio_cmds:
+            items.append(create_ui_text(text="Audio Source", x=0, y=3, size=_SIZE_W5))
+            items.extend(_ui_row(edid_audio_cmds[:5], 4))
 
-        if model_config.edid_audio_sources:
-            items.append(create_ui_text(text="Audio Source", x=0, y=y_pos, size=Size(width=5)))
-            y_pos += 1
-            for i, source in enumerate(model_config.edid_audio_sources[:5]):
-                label = "5.1" if source == "5.1" else source.title()
-                cmd_id = f"set_edidaudio_{source.replace('.', '')}"
-                items.append(create_ui_text(
-                    text=label, 
-                    x=i, 
-                    y=y_pos, 
-                    cmd=EntityCommand(cmd_id, {"command": cmd_id})
-                ))
-
-        return UiPage(page_id="edid", name="EDID", grid=Size(width=5, height=6), items=items)
-
-    def _create_scale_page(self) -> UiPage:
-        items = []
-        y_pos = 0
-        model_config = self._device.model_config
+        return UiPage(page_id="edid", name="EDID", grid=_GRID_5X6, items=items)
 
-        items.append(create_ui_text(text="Scale Mode", x=0, y=y_pos, size=Size(width=5)))
-        y_pos += 1
-        
-        for i, mode in enumerate(model_config.scale_modes[:5]):
-            display_name = mode.replace("_", " ").title()
-            cmd_id = f"set_scalemode_{mode}"
-            items.append(create_ui_text(
-                text=display_name, 
-                x=i, 
-                y=y_pos, 
-                cmd=EntityCommand(cmd_id, {"command": cmd_id})
-            ))
-        
-        y_pos += 2
-        if len(model_config.scale_modes) > 5:
-            for i, mode in enumerate(model_config.scale_modes[5:10]):
-                display_name = mode.replace("_", " ").title()
-                cmd_id = f"set_scalemode_{mode}"
-                items.append(create_ui_text(
-                    text=display_name, 
-                    x=i, 
-                    y=y_pos, 
-                    cmd=EntityCommand(cmd_id, {"command": cmd_id})
-                ))
-
-        return UiPage(page_id="scale", name="Scale", grid=Size(width=5, height=6), items=items)
-
-    def _create_audio_page(self) -> UiPage:
-        items = []
-        model_config = self._device.model_config
+    def _create_scale_page(self, scale_cmds: list[tuple[str, str]]) -> UiPage:
+        items = [create_ui_text(text="Scale Mode", x=0, y=0, size=_SIZE_W5)]
+        items.extend(_ui_row(scale_cmds[:5], 1))
+        items.extend(_ui_row(scale_cmds[5:10], 3))
 
-        items.append(create_ui_text(text="Audio Mode", x=0, y=0, size=Size(width=4)))
-        for i, mode in enumerate(model_config.audio_modes):
-            cmd_id = f"set_audiomode_{mode}"
-            items.append(create_ui_text(
-                text=mode.title(), 
-                x=i, 
-                y=1, 
-                cmd=EntityCommand(cmd_id, {"command": cmd_id})
-            ))
+        return UiPage(page_id="scale", name="Scale", grid=_GRID_5X6, items=items)
 
-        return UiPage(page_id="audio", name="Audio", items=items)
+    def _create_audio_page(self, audio_cmds: list[tuple[str, str]]) -> UiPage:
+        items = [create_ui_text(text="Audio Mode", x=0, y=0, size=_SIZE_W4)]
+        items.extend(_ui_row(audio_cmds, 1))
 
-    def _create_led_page(self) -> UiPage:
-        items = []
-        model_config = self._device.model_config
+        return UiPage(page_id="audio", name="Audio", items=items)
 
-        mode_text_map = {
-            "0": "Off",
-            "1": "Video",
-            "2": "Static",
-            "3": "Blink",
-            "4": "Rotate"
-        }
-        items.append(create_ui_text(text="Ambilight Mode", x=0, y=0, size=Size(width=4)))
-        for i, mode in enumerate(model_config.led_modes):
-            cmd_id = f"set_ledprofilevideo_{mode}"
-            display_text = mode_text_map.get(mode, mode.title())
-            items.append(create_ui_text(
-                text=display_text, 
-                x=i, 
-                y=1, 
-                cmd=EntityCommand(cmd_id, {"command": cmd_id})
-            ))
+    def _create_led_page(self, led_cmds: list[tuple[str, str]]) -> UiPage:
+        items = [create_ui_text(text="Ambilight Mode", x=0, y=0, size=_SIZE_W4)]
+        items.extend(_ui_row(led_cmds, 1))
 
         return UiPage(page_id="led", name="Ambilight", items=items)
 
@@ -265,120 +196,106 @@ class HDFuryRemote(Remote):
         model_config = self._device.model_config
 
         if model_config.hdr_custom_support:
-            items.append(create_ui_text(text="Custom HDR", x=0, y=y_pos, size=Size(width=2)))
+            items.append(create_ui_text(text="Custom HDR", x=0, y=y_pos, size=_SIZE_W2))
             items.append(create_ui_text(
                 text="ON", 
                 x=2, 
                 y=y_pos, 
-                cmd=EntityCommand("set_hdrcustom_on", {"command": "set_hdrcustom_on"})
+                cmd=_cmd("set_hdrcustom_on")
             ))
             items.append(create_ui_text(
                 text="OFF", 
                 x=3, 
                 y=y_pos, 
-                cmd=EntityCommand("set_hdrcustom_off", {"command": "set_hdrcustom_off"})
+                cmd=_cmd("set_hdrcustom_off")
             ))
             y_pos += 1
 
         if model_config.hdr_disable_support:
-            items.append(create_ui_text(text="Disable HDR", x=0, y=y_pos, size=Size(width=2)))
+            items.append(create_ui_text(text="Disable HDR", x=0, y=y_pos, size=_SIZE_W2))
             items.append(create_ui_text(
                 text="ON", 
                 x=2, 
                 y=y_pos, 
-                cmd=EntityCommand("set_hdrdisable_on", {"command": "set_hdrdisable_on"})
+                cmd=_cmd("set_hdrdisable_on")
             ))
             items.append(create_ui_text(
                 text="OFF", 
                 x=3, 
                 y=y_pos, 
-                cmd=EntityCommand("set_hdrdisable_off", {"command": "set_hdrdisable_off"})
+                cmd=_cmd("set_hdrdisable_off")
             ))
         
         return UiPage(page_id="hdr", name="HDR", items=items)
 
-    def _create_cec_earc_page(self) -> UiPage:
+    def _create_cec_earc_page(self, earc_cmds: list[tuple[str, str]]) -> UiPage:
         items = []
         y_pos = 0
         model_config = self._device.model_config
 
         if model_config.cec_support:
-            items.append(create_ui_text(text="CEC Engine", x=0, y=y_pos, size=Size(width=2)))
+            items.append(create_ui_text(text="CEC Engine", x=0, y=y_pos, size=_SIZE_W2))
             items.append(create_ui_text(
                 text="ON", 
                 x=2, 
                 y=y_pos, 
-                cmd=EntityCommand("set_cec_on", {"command": "set_cec_on"})
+                cmd=_cmd("set_cec_on")
             ))
             items.append(create_ui_text(
                 text="OFF", 
                 x=3, 
                 y=y_pos, 
-                cmd=EntityCommand("set_cec_off", {"command": "set_cec_off"})
+                cmd=_cmd("set_cec_off")
             ))
             y_pos += 2
         
-        if model_config.earc_force_modes:
-            items.append(create_ui_text(text="eARC Force", x=0, y=y_pos, size=Size(width=4)))
+        if earc_cmds:
+            items.append(create_ui_text(text="eARC Force", x=0, y=y_pos, size=_SIZE_W4))
             y_pos += 1
-            for i, mode in enumerate(model_config.earc_force_modes[:4]):
-                cmd_id = f"set_earcforce_{mode}"
-                items.append(create_ui_text(
-                    text=mode.title(), 
-                    x=i, 
-                    y=y_pos, 
-                    cmd=EntityCommand(cmd_id, {"command": cmd_id})
-                ))
+            items.extend(_ui_row(earc_cmds[:4], y_pos))
 
         return UiPage(page_id="cec_earc", name="CEC/eARC", items=items)
         
-    def _create_system_page(self) -> UiPage:
+    def _create_system_page(self, hdcp_cmds: list[tuple[str, str]]) -> UiPage:
         items = []
         y_pos = 0
         model_config = self._device.model_config
 
         if model_config.oled_support:
-            items.append(create_ui_text(text="OLED Display", x=0, y=y_pos, size=Size(width=2)))
+            items.append(create_ui_text(text="OLED Display", x=0, y=y_pos, size=_SIZE_W2))
             items.append(create_ui_text(
                 text="ON", 
                 x=2, 
                 y=y_pos, 
-                cmd=EntityCommand("set_oled_on", {"command": "set_oled_on"})
+                cmd=_cmd("set_oled_on")
             ))
             items.append(create_ui_text(
                 text="OFF", 
                 x=3, 
                 y=y_pos, 
-                cmd=EntityCommand("set_oled_off", {"command": "set_oled_off"})
+                cmd=_cmd("set_oled_off")
             ))
             y_pos += 1
 
         if model_config.autoswitch_support:
-            items.append(create_ui_text(text="Autoswitch", x=0, y=y_pos, size=Size(width=2)))
+            items.append(create_ui_text(text="Autoswitch", x=0, y=y_pos, size=_SIZE_W2))
             items.append(create_ui_text(
                 text="ON", 
                 x=2, 
                 y=y_pos, 
-                cmd=EntityCommand("set_autosw_on", {"command": "set_autosw_on"})
+                cmd=_cmd("set_autosw_on")
             ))
             items.append(create_ui_text(
                 text="OFF", 
                 x=3, 
                 y=y_pos, 
-                cmd=EntityCommand("set_autosw_off", {"command": "set_autosw_off"})
+                cmd=_cmd("set_autosw_off")
             ))
             y_pos += 2
 
-        if model_config.hdcp_modes:
-            items.append(create_ui_text(text="HDCP Mode", x=0, y=y_pos, size=Size(width=4)))
+        if hdcp_cmds:
+            items.append(create_ui_text(text="HDCP Mode", x=0, y=y_pos, size=_SIZE_W4))
             y_pos += 1
-            for i, mode in enumerate(model_config.hdcp_modes):
-                cmd_id = f"set_hdcp_{'14' if mode == '1.4' else mode}"
-                items.append(create_ui_text(
-                    text=mode, 
-                    x=i, 
-                    y=y_pos, 
-                    cmd=EntityCommand(cmd_id, {"command": cmd_id})
-                ))
+            items.extend(_ui_row(hdcp_cmds, y_pos))
 
         return UiPage(page_id="system", name="System", items=items)
\ No newline at end of file